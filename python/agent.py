@@ -4,18 +4,50 @@ import json
 import base64
 import asyncio
 import struct
-import traceback
+import logging
 import time
 
 import aiohttp
+import base58
+import orjson
+from nacl.exceptions import BadSignatureError
+from nacl.signing import VerifyKey
 from indy import wallet, did, error, crypto, pairwise, non_secrets
 
 import indy_sdk_utils as utils
 from serializer import json_serializer as Serializer
 from helpers import bytes_to_str, serialize_bytes_json, str_to_bytes
 from message import Message
+from message_queue import MessageQueue
 from router.family_router import FamilyRouter
 
+logger = logging.getLogger(__name__)
+
+_U64BE = struct.Struct(">Q")
+_SIG_TYPE = "did:sov:BzCbsNYhMrjHiqZDTUASHg;spec/signature/1.0/ed25519Sha512_single"
+
+def _is_packed(wire_msg) -> bool:
+    """ Cheaply detect a packed (encrypted) wire message by its leading header.
+    """
+    head = wire_msg[:32]
+    if isinstance(head, str):
+        return '"protected"' in head
+    return b'"protected"' in head
+
+def _verify_signature(signer: str, data: bytes, signature: bytes) -> bool:
+    """ Verify an ed25519 signature with libsodium directly.
+
+        Verification needs only the signer's public verkey, so there is no
+        need to go through the wallet. A signer that is not a valid base58
+        ed25519 verkey raises ValueError, aborting processing of the message
+        as libindy's crypto_verify did.
+    """
+    try:
+        VerifyKey(base58.b58decode(signer)).verify(data, signature)
+    except BadSignatureError:
+        return False
+    return True
+
 class WalletConnectionException(Exception):
     pass
 
@@ -33,10 +65,17 @@ class Agent:
         self.initialized = False
         self.modules = {}
         self.family_router = FamilyRouter()
-        self.message_queue = asyncio.Queue()
+        self.message_queue = MessageQueue()
         self.admin_key = None
         self.agent_admin_key = None
-        self.outbound_admin_message_queue = asyncio.Queue()
+        self._admin_recipients = None
+        self.outbound_admin_message_queue = MessageQueue()
+        self._http_session = None
+        # endpoint -> time of last message sent there
+        self._warm_endpoints = {}
+        # endpoints that rejected or failed a keep-alive ping
+        self._cold_endpoints = set()
+        self._warm_task = None
 
     def register_module(self, module):
         self.modules[module.FAMILY] = module(self)
@@ -48,31 +87,53 @@ class Agent:
     async def start(self):
         """ Message processing loop task.
         """
+        self._warm_task = asyncio.ensure_future(self.keep_connections_warm())
+
         while True:
-            try:
-                wire_msg_bytes = await self.message_queue.get()
+            await self.handle_incoming()
+
+    async def handle_incoming(self, max_batch=32):
+        """ Wait for at least one inbound message, then process every message
+            already queued (up to max_batch) back-to-back.
 
-                # Try to unpack message assuming it's not encrypted
+            Messages are handled in arrival order, one at a time; handlers
+            update wallet records with read-modify-write sequences and admin
+            requests rely on the commands sent before them.
+        """
+        batch = [await self.message_queue.get()]
+        while not self.message_queue.empty() and len(batch) < max_batch:
+            batch.append(self.message_queue.get_nowait())
+
+        for wire_msg_bytes in batch:
+            await self._process_one(wire_msg_bytes)
+
+    async def _process_one(self, wire_msg_bytes):
+        """ Unpack a single wire message and route it to its module.
+        """
+        try:
+            msg = None
+
+            # Packed messages carry the "protected" header first; only try the
+            # plaintext path for everything else.
+            if not _is_packed(wire_msg_bytes):
                 try:
                     msg = Serializer.unpack(wire_msg_bytes)
-                except Exception as e:
-                    print("Message encrypted, attempting to unpack...")
-
-                # TODO: More graceful checking here
-                # (This is an artifact of the provisional wire format and connection protocol)
-                if not isinstance(msg, Message) or "@type" not in msg:
-                    # Message IS encrypted so unpack it
-                    try:
-                        msg = await self.unpack_agent_message(wire_msg_bytes)
-                    except Exception as e:
-                        print('Failed to unpack message: {}\n\nError: {}'.format(wire_msg_bytes, e))
-                        traceback.print_exc()
-                        continue  # handle next message in loop
-
-                await self.route_message_to_module(msg)
-            except Exception as e:
-                    print("\n\n--- Message Processing failed --- \n\n")
-                    traceback.print_exc()
+                except Exception:
+                    logger.debug("Message is not plaintext json, attempting to unpack...")
+
+            # TODO: More graceful checking here
+            # (This is an artifact of the provisional wire format and connection protocol)
+            if not isinstance(msg, Message) or "@type" not in msg:
+                # Message IS encrypted so unpack it
+                try:
+                    msg = await self.unpack_agent_message(wire_msg_bytes)
+                except Exception:
+                    logger.exception('Failed to unpack message: %s', wire_msg_bytes)
+                    return
+
+            await self.route_message_to_module(msg)
+        except Exception:
+            logger.exception("--- Message Processing failed ---")
 
     async def connect_wallet(self, agent_name, passphrase, ephemeral=False):
         """ Create if not already exists and open wallet.
@@ -91,14 +152,14 @@ class Agent:
         if ephemeral:
             try:
                 await wallet.delete_wallet(wallet_config, wallet_credentials)
-                print("Removing ephemeral wallet.")
+                logger.info("Removing ephemeral wallet.")
             except error.IndyError as e:
                 if e.error_code is error.ErrorCode.WalletNotFoundError:
                     pass  # This is ok, and expected.
                 else:
-                    print("Unexpected Indy Error: {}".format(e))
-            except Exception as e:
-                print(e)
+                    logger.error("Unexpected Indy Error: %s", e)
+            except Exception:
+                logger.exception("Could not remove ephemeral wallet")
         # pylint: disable=bare-except
 
         try:
@@ -107,9 +168,9 @@ class Agent:
             if e.error_code is error.ErrorCode.WalletAlreadyExistsError:
                 pass # This is ok, and expected.
             else:
-                print("Unexpected Indy Error: {}".format(e))
-        except Exception as e:
-            print(e)
+                logger.error("Unexpected Indy Error: %s", e)
+        except Exception:
+            logger.exception("Could not create wallet")
 
         try:
             self.wallet_handle = await wallet.open_wallet(
@@ -121,16 +182,31 @@ class Agent:
 
             self.initialized = True
 
-        except Exception as e:
-            print(e)
-            print("Could not open wallet!")
+        except Exception:
+            logger.exception("Could not open wallet!")
 
             raise WalletConnectionException
 
-    async def sign_agent_message_field(self, field_value, my_vk):
-        timestamp_bytes = struct.pack(">Q", int(time.time()))
+    async def shutdown(self):
+        """ Stop keep-alive pings and release outbound HTTP connections.
+        """
+        if self._warm_task is not None:
+            self._warm_task.cancel()
+            try:
+                await self._warm_task
+            except asyncio.CancelledError:
+                pass
+            self._warm_task = None
+
+        if self._http_session is not None:
+            await self._http_session.close()
+            self._http_session = None
+        self._warm_endpoints = {}
 
-        sig_data_bytes = timestamp_bytes + json.dumps(field_value).encode('ascii')
+    async def sign_agent_message_field(self, field_value, my_vk):
+        # 8 byte big-endian timestamp followed by the compact json of the field.
+        # Must be bytes: crypto_sign hands msg straight to ctypes, which rejects bytearray.
+        sig_data_bytes = _U64BE.pack(int(time.time())) + orjson.dumps(field_value)
         sig_data = base64.urlsafe_b64encode(sig_data_bytes).decode('ascii')
 
         signature_bytes = await crypto.crypto_sign(
@@ -143,7 +219,7 @@ class Agent:
         ).decode('ascii')
 
         return {
-            "@type": "did:sov:BzCbsNYhMrjHiqZDTUASHg;spec/signature/1.0/ed25519Sha512_single",
+            "@type": _SIG_TYPE,
             "signer": my_vk,
             "sig_data": sig_data,
             "signature": signature
@@ -152,21 +228,21 @@ class Agent:
     async def unpack_and_verify_signed_agent_message_field(self, signed_field):
         signature_bytes = base64.urlsafe_b64decode(signed_field['signature'].encode('ascii'))
         sig_data_bytes = base64.urlsafe_b64decode(signed_field['sig_data'].encode('ascii'))
-        sig_verified = await crypto.crypto_verify(
+        sig_verified = _verify_signature(
             signed_field['signer'],
             sig_data_bytes,
             signature_bytes
         )
-        data_bytes = base64.urlsafe_b64decode(signed_field['sig_data'])
-        timestamp = struct.unpack(">Q", data_bytes[:8])
-        fieldjson = data_bytes[8:]
-        return json.loads(fieldjson), sig_verified
+        timestamp = _U64BE.unpack_from(sig_data_bytes, 0)[0]
+        fieldjson = memoryview(sig_data_bytes)[_U64BE.size:]
+        return orjson.loads(fieldjson), sig_verified
 
 
     async def unpack_agent_message(self, wire_msg_bytes):
         if isinstance(wire_msg_bytes, str):
-            wire_msg_bytes = bytes(wire_msg_bytes, 'utf-8')
-        unpacked = json.loads(
+            # Packed messages are base64url fields in json, always ascii
+            wire_msg_bytes = wire_msg_bytes.encode('ascii')
+        unpacked = orjson.loads(
             await crypto.unpack_message(
                 self.wallet_handle,
                 wire_msg_bytes
@@ -192,11 +268,12 @@ class Agent:
         return msg
 
     async def send_message_to_agent(self, to_did, msg:Message):
-        print("Sending:", msg)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Sending: %s", msg)
         their_did = to_did
 
-        pairwise_info = json.loads(await pairwise.get_pairwise(self.wallet_handle, their_did))
-        pairwise_meta = json.loads(pairwise_info['metadata'])
+        pairwise_info = orjson.loads(await pairwise.get_pairwise(self.wallet_handle, their_did))
+        pairwise_meta = orjson.loads(pairwise_info['metadata'])
 
         my_did = pairwise_info['my_did']
         their_endpoint = pairwise_meta['their_endpoint']
@@ -215,30 +292,91 @@ class Agent:
             my_ver_key
         )
 
-        async with aiohttp.ClientSession() as session:
-            headers = {
-                'content-type': 'application/ssi-agent-wire'
-            }
-            async with session.post(their_endpoint, data=wire_message, headers=headers) as resp:
-                if resp.status != 202:
-                    print(resp.status)
-                    print(await resp.text())
+        session = await self._get_http()
+        async with session.post(their_endpoint, data=wire_message) as resp:
+            if resp.status != 202:
+                logger.warning(
+                    "Unexpected response from %s: %s %s",
+                    their_endpoint,
+                    resp.status,
+                    await resp.text()
+                )
+
+        if their_endpoint not in self._cold_endpoints:
+            self._warm_endpoints[their_endpoint] = time.monotonic()
+
+    async def keep_connections_warm(self, interval=10, idle_timeout=300):
+        """ Periodically touch recently used endpoints so pooled connections
+            are not evicted while idle.
+
+            Endpoints with no outbound message for idle_timeout seconds stop
+            being pinged. Endpoints that fail or reject the HEAD request (e.g.
+            POST-only endpoints answering 405) are never pinged again.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            if self._http_session is None:
+                continue
+
+            now = time.monotonic()
+            for endpoint, last_sent in list(self._warm_endpoints.items()):
+                if now - last_sent > idle_timeout:
+                    del self._warm_endpoints[endpoint]
+                    continue
+
+                try:
+                    async with self._http_session.request(
+                            'HEAD',
+                            endpoint,
+                            timeout=aiohttp.ClientTimeout(total=2)) as resp:
+                        pingable = resp.status < 400
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    # An unreachable endpoint is not an error here; the next
+                    # real send will report it.
+                    pingable = False
+
+                if not pingable:
+                    self._warm_endpoints.pop(endpoint, None)
+                    self._cold_endpoints.add(endpoint)
+
+    async def _get_http(self):
+        """ Return the shared outbound HTTP session, creating it on first use.
+
+            Reusing a single session keeps connections to agent endpoints
+            alive between messages instead of reconnecting for every send.
+        """
+        if self._http_session is None:
+            self._http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    keepalive_timeout=3600,
+                    ttl_dns_cache=300,
+                    enable_cleanup_closed=True,
+                    force_close=False
+                ),
+                headers={
+                    'content-type': 'application/ssi-agent-wire'
+                }
+            )
+        return self._http_session
 
     async def setup_admin(self, admin_key):
         self.admin_key = admin_key
+        # pack_message takes a list of recipient verkeys; build it once
+        self._admin_recipients = [admin_key]
         self.agent_admin_key = await crypto.create_key(self.wallet_handle, '{}')
-        print("Admin key: ", self.agent_admin_key)
+        logger.info("Admin key: %s", self.agent_admin_key)
 
     async def send_admin_message(self, msg: Message):
         if self.agent_admin_key and self.admin_key:
             msg = await crypto.pack_message(
                 self.wallet_handle,
                 Serializer.pack(msg),
-                [self.admin_key],
+                self._admin_recipients,
                 self.agent_admin_key
             )
             msg = msg.decode('ascii')
         else:
             msg = msg.as_json()
 
-        await self.outbound_admin_message_queue.put(msg)
+        self.outbound_admin_message_queue.put_nowait(msg)
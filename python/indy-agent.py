@@ -10,6 +10,7 @@
 
 import argparse
 import asyncio
+import logging
 import jinja2
 import aiohttp_jinja2
 from aiohttp import web
@@ -39,6 +40,8 @@ if __name__ == "__main__":
     parser.add_argument("--adminkey", type=str, help="Base58 encoded admin interface key")
     args = parser.parse_args()
 
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
     # Configure webapp
     LOOP = asyncio.get_event_loop()
     WEBAPP = web.Application()
@@ -107,3 +110,6 @@ if __name__ == "__main__":
         LOOP.run_forever()
     except KeyboardInterrupt:
         print("exiting")
+    finally:
+        LOOP.run_until_complete(AGENT.shutdown())
+        LOOP.run_until_complete(RUNNER.cleanup())
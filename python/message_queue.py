@@ -0,0 +1,40 @@
+""" Lightweight unbounded queue used to pass messages between the transport
+    handlers and the agent.
+"""
+import asyncio
+from collections import deque
+
+
+class MessageQueue():
+    """ Unbounded FIFO queue backed by a deque and a single Event.
+
+        Offers the subset of the asyncio.Queue interface used by the agent,
+        without the per-item waiter bookkeeping of asyncio.Queue.
+    """
+    def __init__(self):
+        self._items = deque()
+        self._event = asyncio.Event()
+
+    def empty(self):
+        return not self._items
+
+    def qsize(self):
+        return len(self._items)
+
+    def put_nowait(self, item):
+        self._items.append(item)
+        self._event.set()
+
+    async def put(self, item):
+        self.put_nowait(item)
+
+    def get_nowait(self):
+        if not self._items:
+            raise asyncio.QueueEmpty()
+        return self._items.popleft()
+
+    async def get(self):
+        while not self._items:
+            self._event.clear()
+            await self._event.wait()
+        return self._items.popleft()
@@ -1,6 +1,8 @@
 import aiohttp_jinja2
 import jinja2
-import json
+import asyncio
+import logging
+import orjson
 import socket
 from indy import did, wallet, non_secrets, pairwise
 from indy_sdk_utils import get_wallet_records
@@ -10,6 +12,17 @@ from agent import Agent
 from message import Message
 from . import Module
 
+logger = logging.getLogger(__name__)
+
+def _parse_pairwise_records(agent_pairwises_list: list) -> list:
+    """ Parse pairwise records and their metadata as returned by list_pairwise.
+    """
+    pairwise_records = [orjson.loads(agent_pairwise_str) for agent_pairwise_str in agent_pairwises_list]
+    for pairwise_record in pairwise_records:
+        pairwise_record['metadata'] = orjson.loads(pairwise_record['metadata'])
+    return pairwise_records
+
+
 class Admin(Module):
     FAMILY_NAME = "admin"
     VERSION = "1.0"
@@ -18,6 +31,11 @@ class Admin(Module):
     STATE = FAMILY + "state"
     STATE_REQUEST = FAMILY + "state_request"
 
+    # Message() copies the envelope, so this template is never mutated.
+    STATE_ENVELOPE = {'@type': STATE, 'content': None}
+
+    PAIRWISE_EXECUTOR_THRESHOLD = 100
+
     def __init__(self, agent):
         self.agent = agent
         self.router = SimpleRouter()
@@ -27,40 +45,48 @@ class Admin(Module):
         return await self.router.route(msg)
 
     async def state_request(self, _) -> Message:
-        print("Processing state_request")
+        logger.debug("Processing state_request")
 
         if self.agent.initialized:
-            invitations = await get_wallet_records(self.agent.wallet_handle, "invitations")
+            # invitations and pairwise connections are independent wallet lookups
+            (invitations, agent_pairwises_list_str) = await asyncio.gather(
+                get_wallet_records(self.agent.wallet_handle, "invitations"),
+                pairwise.list_pairwise(self.agent.wallet_handle)
+            )
 
             # load up pairwise connections
-            pairwise_records = []
-            agent_pairwises_list_str = await pairwise.list_pairwise(self.agent.wallet_handle)
-            agent_pairwises_list = json.loads(agent_pairwises_list_str)
-            for agent_pairwise_str in agent_pairwises_list:
-                pairwise_record = json.loads(agent_pairwise_str)
-                pairwise_record['metadata'] = json.loads(pairwise_record['metadata'])
-                pairwise_records.append(pairwise_record)
-
-            await self.agent.send_admin_message(
-                Message({
-                    '@type': self.STATE,
-                    'content': {
-                        'initialized': self.agent.initialized,
-                        'agent_name': self.agent.owner,
-                        'invitations': invitations,
-                        'pairwise_connections': pairwise_records,
-                    }
-                })
-            )
+            agent_pairwises_list = orjson.loads(agent_pairwises_list_str)
+            if len(agent_pairwises_list) > self.PAIRWISE_EXECUTOR_THRESHOLD:
+                # Parse large lists off the event loop in a single executor hop
+                pairwise_records = await asyncio.get_event_loop().run_in_executor(
+                    None,
+                    _parse_pairwise_records,
+                    agent_pairwises_list
+                )
+            else:
+                pairwise_records = _parse_pairwise_records(agent_pairwises_list)
+
+            # Sent column-wise; keys are emitted once rather than per record
+            pairwise_columns = {
+                'my_did': [r['my_did'] for r in pairwise_records],
+                'their_did': [r['their_did'] for r in pairwise_records],
+                'metadata': [r['metadata'] for r in pairwise_records],
+            }
+
+            msg = Message(self.STATE_ENVELOPE)
+            msg['content'] = {
+                'initialized': self.agent.initialized,
+                'agent_name': self.agent.owner,
+                'invitations': invitations,
+                'pairwise_connections': pairwise_columns,
+            }
         else:
-            await self.agent.send_admin_message(
-                Message({
-                    '@type': self.STATE,
-                    'content': {
-                        'initialized': self.agent.initialized,
-                        }
-                    })
-            )
+            msg = Message(self.STATE_ENVELOPE)
+            msg['content'] = {
+                'initialized': self.agent.initialized,
+            }
+
+        await self.agent.send_admin_message(msg)
 
 
 @aiohttp_jinja2.template('index.html')
@@ -75,5 +101,5 @@ async def root(request):
     else:
         agent.endpoint += '/indy'
         agent.offer_endpoint += '/offer'
-    print('Agent Offer Endpoint : "{}"'.format(agent.offer_endpoint))
+    logger.info('Agent Offer Endpoint : "%s"', agent.offer_endpoint)
     return {'agent_admin_key': agent.agent_admin_key}
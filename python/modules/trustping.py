@@ -1,6 +1,7 @@
 import aiohttp
 import aiohttp_jinja2
 import jinja2
+import logging
 import base64
 import json
 import time
@@ -14,6 +15,8 @@ from agent import Agent, WalletConnectionException
 from message import Message
 from . import Module
 
+logger = logging.getLogger(__name__)
+
 class AdminTrustPing(Module):
     FAMILY_NAME = "admin_trustping"
     VERSION = "1.0"
@@ -33,8 +36,8 @@ class AdminTrustPing(Module):
         return await self.router.route(msg)
 
     async def trustping_response(self, msg: Message) -> Message:
-        print("trustping_response")
-        print(msg)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("trustping_response: %s", msg)
 
     async def send_trustping(self, msg: Message) -> Message:
         """ UI activated method.
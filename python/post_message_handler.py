@@ -17,5 +17,5 @@ class PostMessageHandler():
             raise web.HTTPUnauthorized()
 
         msg = await request.read()
-        await self.msg_queue.put(msg)
+        self.msg_queue.put_nowait(msg)
         raise web.HTTPAccepted()
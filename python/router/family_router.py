@@ -1,12 +1,15 @@
 """ Simple router for routing messages to a module by family type.
 """
 
+import logging
 import re
 from typing import Callable
 from modules import Module
 from message import Message
 from . import BaseRouter, RouteAlreadyRegisteredException
 
+logger = logging.getLogger(__name__)
+
 class FamilyRouter(BaseRouter):
     """ Simple router for handling Indy Messages.
 
@@ -31,7 +34,7 @@ class FamilyRouter(BaseRouter):
             module = self.routes[family]
             return await module.route(msg)
         else:
-            print("unknown message family: {}".format(family))
+            logger.warning("unknown message family: %s", family)
 
     @staticmethod
     def family_from_type(msg_type: str) -> str:
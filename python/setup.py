@@ -8,5 +8,5 @@ setup(
     url='https://github.com/hyperledger/indy-agent',
     license='MIT/Apache-2.0',
     description='Reference Agent for the Indy-SDK',
-    install_requires=['python3-indy', 'aiohttp', 'serpy', 'aiohttp-index', 'aiohttp-jinja2']
+    install_requires=['python3-indy', 'aiohttp', 'serpy', 'aiohttp-index', 'aiohttp-jinja2', 'orjson', 'PyNaCl', 'base58']
 )
@@ -428,8 +428,13 @@
                         i.history = history_log_format(i.history)
                         this.connections.push(i);
                     });
-                    // Load pairwise connections
-                    this.pairwise_connections = state['pairwise_connections'];
+                    // Load pairwise connections, sent as columns of my_did, their_did and metadata
+                    const pairwise = state['pairwise_connections'];
+                    this.pairwise_connections = pairwise.their_did.map((their_did, i) => ({
+                        my_did: pairwise.my_did[i],
+                        their_did: their_did,
+                        metadata: pairwise.metadata[i]
+                    }));
                 }
             }
         }
@@ -1,7 +1,10 @@
 import asyncio
+import logging
 import aiohttp
 from aiohttp import web
 
+logger = logging.getLogger(__name__)
+
 class WebSocketMessageHandler(object):
     def __init__(self, inbound_queue, outbound_queue):
         self.recv_q = inbound_queue
@@ -33,16 +36,17 @@ class WebSocketMessageHandler(object):
                 if websocket_message.data == 'close':
                     await self.ws.close()
                 else:
-                    print('Received "{}"'.format(websocket_message.data))
-                    await self.recv_q.put(websocket_message.data)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug('Received "%s"', websocket_message.data)
+                    self.recv_q.put_nowait(websocket_message.data)
             elif websocket_message.type == aiohttp.WSMsgType.ERROR:
-                print('ws connection closed with exception %s' %
-                      self.ws.exception())
+                logger.warning('ws connection closed with exception %s', self.ws.exception())
 
-        print('websocket connection closed')
+        logger.info('websocket connection closed')
 
     async def _websocket_send(self):
         while True:
             msg_to_send = await self.send_q.get()
-            print('Sending "{}"'.format(msg_to_send))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Sending "%s"', msg_to_send)
             await self.ws.send_str(msg_to_send)
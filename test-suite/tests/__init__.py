@@ -5,6 +5,7 @@ import json
 import time
 import struct
 import asyncio
+import logging
 import pytest
 from pytest import fail
 from typing import Callable, Any
@@ -14,6 +15,8 @@ from message import Message
 from serializer import JSONSerializer as Serializer
 from transport import BaseTransport
 
+logger = logging.getLogger(__name__)
+
 async def expect_message(transport: BaseTransport, timeout: int):
     get_message_task = asyncio.ensure_future(transport.recv())
     sleep_task = asyncio.ensure_future(asyncio.sleep(timeout))
@@ -32,6 +35,12 @@ async def expect_message(transport: BaseTransport, timeout: int):
 
     fail("No message received before timing out; tested agent failed to respond")
 
+def debug_message(description: str, msg: Message):
+    """ Log a pretty printed message; formatting is skipped unless debug logging is enabled.
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug('\n%s:\n%s', description, msg.pretty_print())
+
 def validate_message(expected_attrs: [Any], msg: Message):
     __tracebackhide__ = True
     for attribute in expected_attrs:
@@ -1,4 +1,6 @@
 import re
+import copy
+import functools
 import base64
 import uuid
 
@@ -18,13 +20,19 @@ class Connection:
 
     class Invite:
         @staticmethod
-        def parse(invite_url: str) -> Message:
+        @functools.lru_cache(maxsize=128)
+        def _decode(invite_url: str) -> dict:
             matches = re.match('(.+)?c_i=(.+)', invite_url)
             assert matches, 'Improperly formatted invite url!'
 
-            invite_msg = Serializer.unpack(
+            return Serializer.unpack(
                 base64.urlsafe_b64decode(matches.group(2)).decode('ascii')
-            )
+            ).to_dict()
+
+        @staticmethod
+        def parse(invite_url: str) -> Message:
+            # Only the decoded dict is cached; every caller gets its own copy
+            invite_msg = Message(copy.deepcopy(Connection.Invite._decode(invite_url)))
 
             validate_message(
                 [
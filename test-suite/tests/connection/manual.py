@@ -1,17 +1,22 @@
 import asyncio
 import pytest
 from message import Message
-from tests import expect_message, validate_message, pack, unpack, sign_field, unpack_and_verify_signed_field
+from tests import expect_message, validate_message, debug_message, pack, unpack, sign_field, unpack_and_verify_signed_field
 from indy import did
 from . import Connection
 
 @pytest.mark.asyncio
 async def test_connection_started_by_tested_agent(config, wallet_handle, transport):
-    invite_url = input('Input generated connection invite: ')
+    # Read from stdin in an executor so transport tasks keep running while waiting
+    invite_url = await asyncio.get_event_loop().run_in_executor(
+        None,
+        input,
+        'Input generated connection invite: '
+    )
 
     invite_msg = Connection.Invite.parse(invite_url)
 
-    print("\nReceived Invite:\n", invite_msg.pretty_print())
+    debug_message("Received Invite", invite_msg)
 
     # Create my information for connection
     (my_did, my_vk) = await did.create_and_store_my_did(wallet_handle, '{}')
@@ -24,7 +29,7 @@ async def test_connection_started_by_tested_agent(config, wallet_handle, transpo
         config.endpoint
     )
 
-    print("\nSending Request:\n", request.pretty_print())
+    debug_message("Sending Request", request)
 
     await transport.send(
         invite_msg['serviceEndpoint'],
@@ -47,12 +52,12 @@ async def test_connection_started_by_tested_agent(config, wallet_handle, transpo
     )
 
     Connection.Response.validate_pre_sig(response)
-    print("\nReceived Response (pre signature verification):\n", response.pretty_print())
+    debug_message("Received Response (pre signature verification)", response)
 
     response['connection'] = await unpack_and_verify_signed_field(response['connection~sig'])
 
     Connection.Response.validate(response, request.id)
-    print("\nReceived Response (post signature verification):\n", response.pretty_print())
+    debug_message("Received Response (post signature verification)", response)
 
 async def get_connection_started_by_suite(config, wallet_handle, transport, label=None):
     if label is None:
@@ -74,18 +79,18 @@ async def get_connection_started_by_suite(config, wallet_handle, transport, labe
     )
 
     Connection.Request.validate(request)
-    print("\nReceived request:\n", request.pretty_print())
+    debug_message("Received request", request)
 
     (their_did, their_vk, their_endpoint) = Connection.Request.parse(request)
 
     (my_did, my_vk) = await did.create_and_store_my_did(wallet_handle, '{}')
 
     response = Connection.Response.build(request.id, my_did, my_vk, config.endpoint)
-    print("\nSending Response (pre signature packing):\n", response.pretty_print())
+    debug_message("Sending Response (pre signature packing)", response)
 
     response['connection~sig'] = await sign_field(wallet_handle, connection_key, response['connection'])
     del response['connection']
-    print("\nSending Response (post signature packing):\n", response.pretty_print())
+    debug_message("Sending Response (post signature packing)", response)
 
     await transport.send(
         their_endpoint,